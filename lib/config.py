@@ -4,20 +4,81 @@ Centralized configuration management with environment variable support.
 """
 
 import os
-from dataclasses import dataclass, field
-from enum import Enum, auto
-from typing import Optional
-from dotenv import load_dotenv
+import re
+import sys
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import cached_property, lru_cache
+from typing import Mapping, Optional
 
-load_dotenv()
 
+_dotenv_loaded = False
 
-class SourceType(Enum):
+
+def _load_dotenv_once() -> None:
+    """Parse .env at most once per process (each reload worker reads its own copy)."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+    _dotenv_loaded = True
+
+
+# Accepted spellings for boolean env flags (compared lowercased)
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+def _env_bool(env: Mapping[str, str], name: str) -> bool:
+    """Return True if the env var is set to a truthy value."""
+    value = env.get(name)
+    return value is not None and value.lower() in _TRUTHY
+
+
+def _env_int(env: Mapping[str, str], name: str, default: int) -> int:
+    """Parse an int env var; the default is used as-is when the var is unset."""
+    value = env.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+
+def _env_float(env: Mapping[str, str], name: str, default: Optional[float]) -> Optional[float]:
+    """Parse a float env var; the default is used as-is when the var is unset."""
+    value = env.get(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+
+
+class SourceType(IntEnum):
     """Type of video source for FFmpeg configuration."""
-    FILE = auto()           # Local video file (can loop, needs -re pacing)
-    LIVE_STREAM = auto()    # RTSP/HTTP/etc streams (already real-time)
-    DEVICE = auto()         # Camera devices (/dev/video0, avfoundation)
-    GROWING_FILE = auto()   # File being written to (OBS recording)
+    FILE = 1            # Local video file (can loop, needs -re pacing)
+    LIVE_STREAM = 2     # RTSP/HTTP/etc streams (already real-time)
+    DEVICE = 3          # Camera devices (/dev/video0, avfoundation)
+    GROWING_FILE = 4    # File being written to (OBS recording)
+
+
+# Source types that already produce data in real time
+_LIVE_SOURCE_TYPES = frozenset({SourceType.LIVE_STREAM, SourceType.DEVICE})
+
+
+# Single-pass source classifier. Alternatives at position 0 are tried in
+# priority order; only the "proto" group means a network stream, every other
+# group is a capture device. Scheme/prefix matches are case-insensitive,
+# /dev/video is not (Linux paths are case-sensitive).
+_SOURCE_RE = re.compile(
+    r"(?P<proto>^(?i:rtsp|rtmp|https?|srt|udp|tcp|rtp)://)"   # network streams
+    r"|(?P<avf>^(?i:avfoundation):)"                          # macOS capture
+    r"|(?P<dev>^/dev/video)"                                  # Linux V4L2
+    r"|(?P<dshow>^(?i:dshow):|(?i:video=))"                   # Windows DirectShow
+)
 
 
 def detect_source_type(path: str) -> SourceType:
@@ -30,36 +91,28 @@ def detect_source_type(path: str) -> SourceType:
     - DEVICE: no pacing, no loop, may need -f flag
     - GROWING_FILE: -re for pacing, but no loop
     """
-    path_lower = path.lower()
-    
-    # Protocol-based streams
-    if any(path_lower.startswith(proto) for proto in [
-        "rtsp://", "rtmp://", "http://", "https://", 
-        "srt://", "udp://", "tcp://", "rtp://"
-    ]):
-        return SourceType.LIVE_STREAM
-    
-    # macOS screen/camera capture
-    if path_lower.startswith("avfoundation:"):
-        return SourceType.DEVICE
-    
-    # Linux device files
-    if path.startswith("/dev/video"):
-        return SourceType.DEVICE
-    
-    # Windows DirectShow (typically "video=Device Name")
-    if "video=" in path_lower or path_lower.startswith("dshow:"):
+    # GROWING_FILE is part of the cache key so env changes are still honoured
+    return _classify_source(path, _env_bool(os.environ, "GROWING_FILE"))
+
+
+@lru_cache(maxsize=32)
+def _classify_source(path: str, growing: bool) -> SourceType:
+    """Classify a source path (memoized — paths rarely change at runtime)."""
+    match = _SOURCE_RE.search(path)
+    if match is not None:
+        if match.lastgroup == "proto":
+            return SourceType.LIVE_STREAM
         return SourceType.DEVICE
     
-    # Check for GROWING_FILE env var hint
-    if os.getenv("GROWING_FILE", "").lower() in ("1", "true", "yes"):
+    # GROWING_FILE env var hint
+    if growing:
         return SourceType.GROWING_FILE
     
     # Default: treat as regular file
     return SourceType.FILE
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True)  # no slots: cached_property needs the instance __dict__
 class VideoConfig:
     """Video streaming configuration."""
     file_path: str = "video.mp4"
@@ -68,89 +121,116 @@ class VideoConfig:
     audio_bitrate: str = "128k"        # AAC audio bitrate
     resolution: Optional[str] = None   # e.g., "1280x720", None = original
     quality: Optional[float] = None    # 0.0 (worst) to 1.0 (best) — controls CRF + resolution
-    chunk_buffer_size: int = 64        # Client queue size (large for raw byte streaming)
+    chunk_buffer_size: int = 64        # Client queue length cap (messages, not bytes)
+    client_buffer_bytes: int = 1 << 20  # Client queue byte budget; oldest chunks dropped beyond
+    ffmpeg_nice: int = 0               # Niceness added to FFmpeg (0 = server's priority)
+    
+    # Derived values are cached_property: the dataclass is frozen, so they
+    # never change and are computed on first access only.
+    @cached_property
+    def _quality_mapping(self) -> Optional[tuple[int, float]]:
+        """Clamp quality once and derive (crf, scale) from it; None if quality is unset."""
+        if self.quality is None:
+            return None
+        q = max(0.0, min(1.0, self.quality))
+        return round(40 - q * 22), 0.25 + q * 0.75  # 1.0→(18, 1.0), 0.0→(40, 0.25)
     
-    @property
+    @cached_property
     def effective_crf(self) -> int:
         """Get effective H.264 CRF value (0=lossless, 51=worst).
         
         If quality is set, maps 1.0→18 (high quality) and 0.0→40 (low quality).
         Otherwise uses the explicit crf setting.
         """
-        if self.quality is not None:
-            q = max(0.0, min(1.0, self.quality))
-            return round(40 - q * 22)  # 1.0→18, 0.0→40
-        return self.crf
+        mapping = self._quality_mapping
+        return mapping[0] if mapping is not None else self.crf
     
-    @property
+    @cached_property
     def effective_scale(self) -> Optional[float]:
         """Get resolution scale factor (0.0-1.0) from quality setting.
         
         Maps quality 1.0→1.0 (full res) and 0.0→0.25 (quarter res).
         Returns None if quality is not set (use explicit resolution instead).
         """
-        if self.quality is not None:
-            q = max(0.0, min(1.0, self.quality))
-            return 0.25 + q * 0.75  # 1.0→1.0, 0.0→0.25
-        return None
+        mapping = self._quality_mapping
+        return mapping[1] if mapping is not None else None
     
-    @property
+    @cached_property
     def source_type(self) -> SourceType:
         """Detect source type from file path."""
         return detect_source_type(self.file_path)
     
-    @property
+    @cached_property
     def is_live_source(self) -> bool:
         """Returns True if source is live (no pacing/looping needed)."""
-        return self.source_type in (SourceType.LIVE_STREAM, SourceType.DEVICE)
+        return self.source_type in _LIVE_SOURCE_TYPES
     
-    @property
+    @cached_property
     def can_loop(self) -> bool:
         """Returns True if source can be looped."""
         return self.source_type == SourceType.FILE
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AudioConfig:
     """Audio streaming configuration (AAC output)."""
     bitrate: str = "128k"   # AAC bitrate
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """Server configuration."""
     host: str = "127.0.0.1"
     port: int = 8000
-    connection_timeout: float = 5.0
+    connection_timeout: float = 5.0  # Unused since streams stopped polling; kept for callers
     max_clients: int = 100
 
 
-@dataclass
+# Shared defaults — the section configs are frozen, so one instance is safe to share
+_DEFAULT_VIDEO = VideoConfig()
+_DEFAULT_AUDIO = AudioConfig()
+_DEFAULT_SERVER = ServerConfig()
+
+
+@dataclass(slots=True)
 class AppConfig:
     """Main application configuration."""
-    video: VideoConfig = field(default_factory=VideoConfig)
-    audio: AudioConfig = field(default_factory=AudioConfig)
-    server: ServerConfig = field(default_factory=ServerConfig)
+    video: VideoConfig = _DEFAULT_VIDEO
+    audio: AudioConfig = _DEFAULT_AUDIO
+    server: ServerConfig = _DEFAULT_SERVER
     
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> "AppConfig":
-        """Create configuration from environment variables."""
+        """Create configuration from environment variables (built once, then cached)."""
+        _load_dotenv_once()
+        env = dict(os.environ)  # one snapshot instead of a getenv per setting
+        
+        # Interned so the video and audio configs share one bitrate string and
+        # comparisons against these values are pointer checks.
+        audio_bitrate = sys.intern(env.get("AUDIO_BITRATE", "128k"))
+        resolution = env.get("VIDEO_RESOLUTION")  # e.g., "1280x720"
+        # Only root may lower niceness; a negative value would fail every FFmpeg spawn
+        ffmpeg_nice = _env_int(env, "FFMPEG_NICE", 0)
+        if ffmpeg_nice < 0:
+            raise ValueError(f"FFMPEG_NICE must be >= 0, got {ffmpeg_nice}")
         return cls(
             video=VideoConfig(
-                file_path=os.getenv("VIDEO_FILE", "video.mp4"),
-                fps=int(os.getenv("VIDEO_FPS", "30")),
-                crf=int(os.getenv("VIDEO_CRF", "23")),
-                audio_bitrate=os.getenv("AUDIO_BITRATE", "128k"),
-                resolution=os.getenv("VIDEO_RESOLUTION"),  # e.g., "1280x720"
-                quality=float(os.environ["VIDEO_QUALITY"]) if "VIDEO_QUALITY" in os.environ else None,
+                file_path=sys.intern(env.get("VIDEO_FILE", "video.mp4")),
+                fps=_env_int(env, "VIDEO_FPS", 30),
+                crf=_env_int(env, "VIDEO_CRF", 23),
+                audio_bitrate=audio_bitrate,
+                resolution=sys.intern(resolution) if resolution is not None else None,
+                quality=_env_float(env, "VIDEO_QUALITY", None),
+                ffmpeg_nice=ffmpeg_nice,
             ),
             audio=AudioConfig(
-                bitrate=os.getenv("AUDIO_BITRATE", "128k"),
+                bitrate=audio_bitrate,
             ),
             server=ServerConfig(
-                host=os.getenv("SERVER_HOST", "127.0.0.1"),
-                port=int(os.getenv("SERVER_PORT", "8000")),
-                max_clients=int(os.getenv("MAX_CLIENTS", "100")),
+                host=sys.intern(env.get("SERVER_HOST", "127.0.0.1")),
+                port=_env_int(env, "SERVER_PORT", 8000),
+                max_clients=_env_int(env, "MAX_CLIENTS", 100),
             ),
         )
 
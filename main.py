@@ -1,6 +1,14 @@
+import asyncio
+import gzip
+import hashlib
 import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, Callable, Awaitable
+from stat import S_ISREG
+from typing import Dict, Any, Callable, Awaitable, List, Optional, Set, Tuple
 
 from lib import config
 from services import (
@@ -11,20 +19,226 @@ from services import (
     broadcaster,
 )
 
+try:
+    import brotli  # Optional: Brotli variants are only built when available
+except ImportError:
+    brotli = None
+
 # Directory holding static assets (index.html, player.js, player.css)
 PUBLIC_DIR = Path(__file__).resolve().parent / "public"
 
-# MIME types for static files
-MIME_TYPES: Dict[str, str] = {
-    ".html": "text/html; charset=utf-8",
-    ".js": "application/javascript; charset=utf-8",
-    ".css": "text/css; charset=utf-8",
-    ".json": "application/json",
-    ".png": "image/png",
-    ".svg": "image/svg+xml",
-    ".ico": "image/x-icon",
+# MIME types for static files (already in header wire form)
+MIME_TYPES: Dict[str, bytes] = {
+    ".html": b"text/html; charset=utf-8",
+    ".js": b"application/javascript; charset=utf-8",
+    ".css": b"text/css; charset=utf-8",
+    ".json": b"application/json",
+    ".png": b"image/png",
+    ".svg": b"image/svg+xml",
+    ".ico": b"image/x-icon",
 }
 
+# Cache policy for content-hashed asset URLs (the URL changes whenever the content does)
+IMMUTABLE_CACHE_CONTROL = b"public, max-age=31536000, immutable"
+
+# Content codings we pre-compress to, in order of preference
+ENCODING_PREFERENCE = (b"br", b"gzip")
+
+
+# Body message for header-only responses (304s)
+EMPTY_BODY_MESSAGE: Dict[str, Any] = {"type": "http.response.body", "body": b""}
+
+
+# Comment patterns stripped by _minify (block comments only where they can't hide in strings)
+_CSS_COMMENT_RE = re.compile(rb"/\*.*?\*/", re.DOTALL)
+_HTML_COMMENT_RE = re.compile(rb"<!--.*?-->", re.DOTALL)
+
+# {{name}} slots in the index.html shell, filled once at load time
+_SLOT_RE = re.compile(rb"\{\{(\w+)\}\}")
+
+
+def _render_shell(body: bytes, bindings: Dict[str, str]) -> bytes:
+    """Fill the {{name}} slots of a page shell from its bindings."""
+    return _SLOT_RE.sub(lambda m: bindings[m.group(1).decode()].encode(), body)
+
+
+def _minify(filename: str, body: bytes) -> bytes:
+    """Conservatively shrink HTML/CSS/JS once at load time.
+    
+    Drops comments, indentation and blank lines but never joins lines, so
+    JavaScript's automatic semicolon insertion behaves exactly as before.
+    """
+    ext = Path(filename).suffix.lower()
+    if ext == ".css":
+        body = _CSS_COMMENT_RE.sub(b"", body)
+    elif ext == ".html":
+        body = _HTML_COMMENT_RE.sub(b"", body)
+    elif ext != ".js":
+        return body
+    
+    lines = (line.strip() for line in body.splitlines())
+    if ext == ".js":
+        # Whole-line // comments only — trailing ones may sit inside strings
+        lines = (line for line in lines if not line.startswith(b"//"))
+    return b"\n".join(line for line in lines if line)
+
+
+def _compress(body: bytes) -> Dict[bytes, bytes]:
+    """Compress a body once per supported coding, keeping only the ones that shrink it."""
+    encoded = {b"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded[b"br"] = brotli.compress(body, quality=11)
+    return {coding: data for coding, data in encoded.items() if len(data) < len(body)}
+
+
+def _static_request_headers(scope: Dict[str, Any]) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """Return (accept-encoding, if-none-match) from one pass over the request headers.
+    
+    Names are already lowercase in ASGI; the first occurrence of each wins.
+    """
+    accept_encoding = if_none_match = None
+    for key, value in scope.get("headers", ()):
+        if key == b"accept-encoding":
+            if accept_encoding is None:
+                accept_encoding = value
+        elif key == b"if-none-match":
+            if if_none_match is None:
+                if_none_match = value
+    return accept_encoding, if_none_match
+
+
+def _accepted_encodings(accept_encoding: bytes) -> Set[bytes]:
+    """Parse an Accept-Encoding header value into a set of codings (q=0 excluded)."""
+    accepted: Set[bytes] = set()
+    for token in accept_encoding.lower().split(b","):
+        coding, _, params = token.partition(b";")
+        params = params.strip()
+        if params.startswith(b"q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+def _etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    """Check an If-None-Match header value against an entity tag (weak comparison)."""
+    if if_none_match.strip() == b"*":
+        return True
+    tags = (tag.strip().removeprefix(b"W/") for tag in if_none_match.split(b","))
+    return etag.removeprefix(b"W/") in tags
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    """A public/ file held in memory with its response headers pre-encoded."""
+    body: bytes
+    headers: List[Tuple[bytes, bytes]]
+    etag: bytes
+    start_message: Dict[str, Any]  # ready-to-send ASGI messages for a 200
+    body_message: Dict[str, Any]
+    not_modified_message: Dict[str, Any]  # ...and the start of a 304 (validators only)
+    variants: Dict[bytes, "StaticAsset"] = field(default_factory=dict)  # coding → compressed
+    
+    @classmethod
+    def from_bytes(
+        cls,
+        filename: str,
+        body: bytes,
+        compress: bool = True,
+        cache_control: bytes = b"no-cache",
+    ) -> "StaticAsset":
+        """Build an asset, encoding its headers and compressed variants once."""
+        content_type = MIME_TYPES.get(Path(filename).suffix.lower(), b"application/octet-stream")
+        compressed = _compress(body) if compress else {}
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        
+        def build(data: bytes, coding: Optional[bytes] = None) -> "StaticAsset":
+            # Each representation gets its own strong tag: "<hash>" or "<hash>-gzip"
+            etag = f'"{digest}-{coding.decode()}"' if coding else f'"{digest}"'
+            validators = [
+                (b"etag", etag.encode()),
+                (b"cache-control", cache_control),
+            ]
+            if compressed:
+                validators.append((b"vary", b"accept-encoding"))
+            headers = [
+                (b"content-type", content_type),
+                (b"content-length", str(len(data)).encode()),
+                *validators,
+            ]
+            if coding is not None:
+                headers.append((b"content-encoding", coding))
+            return cls(
+                body=data,
+                headers=headers,
+                etag=etag.encode(),
+                start_message={"type": "http.response.start", "status": 200, "headers": headers},
+                body_message={"type": "http.response.body", "body": data},
+                not_modified_message={
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": validators,
+                },
+            )
+        
+        asset = build(body)
+        asset.variants.update(
+            (coding, build(data, coding)) for coding, data in compressed.items()
+        )
+        return asset
+    
+    def negotiate(self, accepted: Set[bytes]) -> "StaticAsset":
+        """Pick the best pre-compressed variant the client accepts (or the identity body)."""
+        for coding in ENCODING_PREFERENCE:
+            if coding in accepted and coding in self.variants:
+                return self.variants[coding]
+        return self
+
+
+def _versioned_name(filename: str, body: bytes) -> str:
+    """Return e.g. player.3f9a0c1d2e4b5a6f.js — a URL that changes with the content."""
+    path = Path(filename)
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def _load_static_files() -> Dict[str, StaticAsset]:
+    """Read the player assets once at import — they don't change at runtime."""
+    raw = {
+        path.name: _minify(path.name, path.read_bytes())
+        for path in PUBLIC_DIR.iterdir() if path.is_file()
+    }
+    assets = {
+        name: StaticAsset.from_bytes(name, body)
+        for name, body in raw.items() if name != "index.html"
+    }
+    
+    # index.html is a shell; it links content-hashed copies of the CSS/JS so
+    # browsers can cache those forever and only revalidate the small page
+    bindings = {}
+    for slot, name in (("player_css", "player.css"), ("player_js", "player.js")):
+        versioned = _versioned_name(name, raw[name])
+        assets[versioned] = StaticAsset.from_bytes(
+            versioned, raw[name], cache_control=IMMUTABLE_CACHE_CONTROL
+        )
+        bindings[slot] = "/" + versioned
+    assets["index.html"] = StaticAsset.from_bytes(
+        "index.html", _render_shell(raw["index.html"], bindings)
+    )
+    return assets
+
+
+# In-memory public/ files, keyed by filename
+STATIC_FILES: Dict[str, StaticAsset] = _load_static_files()
+
+# Files added to public/ after startup: path → (mtime_ns, asset), in LRU order
+# (dict insertion order; hits are re-inserted, the least recently used is evicted)
+DISK_CACHE_SIZE = 32
+_disk_cache: Dict[Path, Tuple[int, StaticAsset]] = {}
+
 
 # Configure logging
 logging.basicConfig(
@@ -49,33 +263,39 @@ class StreamingApp:
     - /stats       → Server statistics (JSON)
     - /player.js   → Player JavaScript
     - /player.css  → Player styles
+    - /player.<hash>.js|css → Content-hashed copies linked by the page (immutable)
     - /            → Web player interface (index.html)
     """
     
     def __init__(self):
-        self._api_routes = {
+        self._routes: Dict[str, Callable[[Scope, Receive, Send], Awaitable[None]]] = {
             "/stream": HttpStreamHandler.handle,
             "/stats": StatsHandler.handle,
         }
+        # Every in-memory asset gets its own route, so serving one is a single lookup
+        for name, asset in STATIC_FILES.items():
+            self._routes[sys.intern("/" + name)] = partial(self._serve_asset, asset)
+        self._routes["/"] = self._routes["/index.html"]
+        self._dispatch = self._routes.get  # bound once; __call__ skips the attribute walk
+        self._broadcaster_started = False
         connection_manager.set_max_clients(config.server.max_clients)
-        logger.info(f"StreamingApp initialized with max {config.server.max_clients} clients")
+        logger.info("StreamingApp initialized with max %s clients", config.server.max_clients)
     
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """ASGI application entry point."""
-        if scope["type"] == "lifespan":
-            await self._handle_lifespan(scope, receive, send)
+        # Check http first: lifespan arrives once per process, http on every request
+        scope_type = scope["type"]
+        if scope_type == "http":
+            # Normally started by lifespan; this covers servers run with lifespan off
+            if not self._broadcaster_started:
+                self._broadcaster_started = await ensure_broadcaster_running()
+            
+            handler = self._dispatch(scope.get("path", "/"), self._serve_unrouted)
+            await handler(scope, receive, send)
             return
         
-        if scope["type"] == "http":
-            await ensure_broadcaster_running()
-            
-            path = scope.get("path", "/")
-            handler = self._api_routes.get(path)
-            
-            if handler:
-                await handler(scope, receive, send)
-            else:
-                await self._serve_static(path, scope, receive, send)
+        if scope_type == "lifespan":
+            await self._handle_lifespan(scope, receive, send)
             return
     
     async def _handle_lifespan(self, scope: Scope, receive: Receive, send: Send) -> None:
@@ -85,49 +305,80 @@ class StreamingApp:
             
             if message["type"] == "lifespan.startup":
                 logger.info("ASGI lifespan: startup")
+                self._broadcaster_started = await ensure_broadcaster_running()
                 await send({"type": "lifespan.startup.complete"})
                 
             elif message["type"] == "lifespan.shutdown":
                 logger.info("ASGI lifespan: shutdown - stopping broadcaster")
                 await broadcaster.stop()
+                self._broadcaster_started = False
                 logger.info("Broadcaster stopped, completing shutdown")
                 await send({"type": "lifespan.shutdown.complete"})
                 return
     
-    async def _serve_static(self, path: str, scope: Scope, receive: Receive, send: Send) -> None:
-        """Serve static files from public/ directory."""
-        # Map / to index.html
-        filename = "index.html" if path == "/" else path.lstrip("/")
+    async def _serve_asset(
+        self,
+        asset: StaticAsset,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Serve an in-memory public/ file, negotiating encoding and conditional GETs."""
+        accept_encoding, if_none_match = _static_request_headers(scope)
+        if asset.variants and accept_encoding is not None:
+            asset = asset.negotiate(_accepted_encodings(accept_encoding))
         
+        # Conditional GET: the client already has this exact representation
+        if if_none_match is not None and _etag_matches(if_none_match, asset.etag):
+            await send(asset.not_modified_message)
+            await send(EMPTY_BODY_MESSAGE)
+            return
+        
+        await self._send_static(send, asset)
+    
+    async def _serve_unrouted(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Fallback for paths without a route: a public/ file added after startup, or 404."""
+        await self._serve_from_disk(scope.get("path", "/").lstrip("/"), scope, send)
+    
+    async def _serve_from_disk(self, filename: str, scope: Scope, send: Send) -> None:
+        """Serve a public/ file that wasn't present at startup."""
         # Prevent directory traversal
         file_path = (PUBLIC_DIR / filename).resolve()
-        if not str(file_path).startswith(str(PUBLIC_DIR)):
+        if not file_path.is_relative_to(PUBLIC_DIR):
             await self._send_error(send, 403, b"Forbidden")
             return
         
-        if not file_path.is_file():
-            await self._send_error(send, 404, b"Not found")
+        # Non-canonical spellings of a startup asset ("//index.html", "/index.html/")
+        # get the in-memory copy; index.html on disk is an unrendered template
+        if file_path.parent == PUBLIC_DIR and file_path.name in STATIC_FILES:
+            await self._serve_asset(STATIC_FILES[file_path.name], scope, None, send)
             return
         
-        # Determine content type
-        ext = file_path.suffix.lower()
-        content_type = MIME_TYPES.get(ext, "application/octet-stream")
+        try:
+            st = file_path.stat()
+        except OSError:
+            st = None
+        if st is None or not S_ISREG(st.st_mode):
+            await self._send_error(send, 404, b"Not found")
+            return
         
-        body = file_path.read_bytes()
+        entry = _disk_cache.pop(file_path, None)
+        if entry is None or entry[0] != st.st_mtime_ns:
+            body = await asyncio.to_thread(file_path.read_bytes)
+            entry = (st.st_mtime_ns, StaticAsset.from_bytes(file_path.name, body, compress=False))
+        # (Re)insert as most recently used; evict from the least recently used end
+        _disk_cache[file_path] = entry
+        while len(_disk_cache) > DISK_CACHE_SIZE:
+            del _disk_cache[next(iter(_disk_cache))]
+        asset = entry[1]
         
-        await send({
-            "type": "http.response.start",
-            "status": 200,
-            "headers": [
-                (b"content-type", content_type.encode()),
-                (b"content-length", str(len(body)).encode()),
-                (b"cache-control", b"no-cache"),
-            ],
-        })
-        await send({
-            "type": "http.response.body",
-            "body": body,
-        })
+        await self._serve_asset(asset, scope, None, send)
+    
+    @staticmethod
+    async def _send_static(send: Send, asset: StaticAsset) -> None:
+        """Send a static file using its pre-built response messages."""
+        await send(asset.start_message)
+        await send(asset.body_message)
     
     @staticmethod
     async def _send_error(send: Send, status: int, body: bytes) -> None:
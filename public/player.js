@@ -15,7 +15,7 @@
   let isMuted = true;
   let volume = 70;
   let hideTimeout = null;
-  let streamReader = null;
+  let streamAbort = null;
   let streamStartAt = null;
 
   let audioCtx = null;
@@ -23,6 +23,7 @@
 
   let uptimeInterval = null;
   let bufferInterval = null;
+  let trimInterval = null;
 
   // Ambient light
   let ambientRAF = null;
@@ -37,15 +38,10 @@
   const overlayBtn = $("overlayBtn");
   const controls = $("controls");
   const playerWrapper = $("playerWrapper");
-  const playerGlow = $("playerGlow");
-  const playIcon = $("playIcon");
-  const pauseIcon = $("pauseIcon");
   const volumeIcon = $("volumeIcon");
   const muteIcon = $("muteIcon");
   const expandIcon = $("expandIcon");
   const compressIcon = $("compressIcon");
-  const liveBadge = $("liveBadge");
-  const offlineBadge = $("offlineBadge");
   const headerDot = $("headerDot");
   const headerStatus = $("headerStatus");
   const statusDot = $("statusDot");
@@ -130,6 +126,12 @@
     if (audioCtx && audioCtx.state === "suspended") audioCtx.resume();
   }
 
+  // The context lives for the whole page; suspending it while stopped
+  // frees the audio thread without the cost of re-creating it on play.
+  function suspendAudio() {
+    if (audioCtx && audioCtx.state === "running") audioCtx.suspend();
+  }
+
   // ── Telemetry ───────────────────────────────────────────
   function fmt(ms) {
     const s = Math.floor(ms / 1000);
@@ -212,6 +214,7 @@
     setStatus("connecting", "Connecting…");
     updateUI();
     setupAudio();
+    resumeAudio();
 
     if (canUseMSE()) {
       startMSE();
@@ -265,55 +268,66 @@
       }
       sb.mode = "sequence";
 
+      // One listener for the buffer's lifetime; every wait on the current
+      // update shares a single promise instead of adding its own listener
+      let updateEnd = null;
+      let resolveUpdateEnd = null;
+      sb.addEventListener("updateend", () => {
+        if (resolveUpdateEnd) resolveUpdateEnd();
+        updateEnd = resolveUpdateEnd = null;
+      });
+      const waitUpdateEnd = () =>
+        sb.updating ? (updateEnd ??= new Promise((r) => { resolveUpdateEnd = r; })) : null;
+
+      // Trim played-out media on a timer, only while the buffer is idle,
+      // so the append path never waits on a remove()
+      clearInterval(trimInterval);
+      const trimTimer = (trimInterval = setInterval(() => {
+        try {
+          if (sb.updating || sb.buffered.length === 0) return;
+          const ct = video.currentTime;
+          if (ct > 8) sb.remove(0, ct - 5);
+        } catch (_) { /* buffer detached — the stream is ending */ }
+      }, 2000));
+
       try {
-        const res = await fetch("/stream");
+        streamAbort = new AbortController();
+        const { signal } = streamAbort;
+        const res = await fetch("/stream", { signal });
         if (!res.ok) throw new Error("HTTP " + res.status);
 
-        streamReader = res.body.getReader();
         video.play().catch(() => { overlayText.textContent = "Tap to play"; });
 
-        let appends = 0;
-        while (true) {
-          const { done, value } = await streamReader.read();
-          if (done) break;
-
-          if (sb.updating)
-            await new Promise((r) => sb.addEventListener("updateend", r, { once: true }));
-
-          try {
-            sb.appendBuffer(value);
-          } catch (e) {
-            if (e.name === "QuotaExceededError") {
-              if (sb.updating)
-                await new Promise((r) => sb.addEventListener("updateend", r, { once: true }));
-              if (sb.buffered.length > 0) {
-                sb.remove(0, Math.max(0, video.currentTime - 2));
-                await new Promise((r) => sb.addEventListener("updateend", r, { once: true }));
-              }
-              sb.appendBuffer(value);
-            } else throw e;
-          }
-
-          if (++appends % 50 === 0 && sb.buffered.length > 0) {
-            const ct = video.currentTime;
-            if (ct > 8) {
-              if (sb.updating)
-                await new Promise((r) => sb.addEventListener("updateend", r, { once: true }));
-              try {
-                sb.remove(0, ct - 5);
-                await new Promise((r) => sb.addEventListener("updateend", r, { once: true }));
-              } catch (_) { /* ignore */ }
+        // The browser pumps the body into this sink; each write's promise
+        // is the backpressure, so there is no hand-rolled read loop
+        const sink = new WritableStream({
+          async write(chunk) {
+            await waitUpdateEnd();
+
+            try {
+              sb.appendBuffer(chunk);
+            } catch (e) {
+              if (e.name === "QuotaExceededError") {
+                await waitUpdateEnd();
+                if (sb.buffered.length > 0) {
+                  sb.remove(0, Math.max(0, video.currentTime - 2));
+                  await waitUpdateEnd();
+                }
+                sb.appendBuffer(chunk);
+              } else throw e;
             }
-          }
-        }
+          },
+        });
+        await res.body.pipeTo(sink, { signal });
       } catch (e) {
         if (e.name !== "AbortError") console.error("Stream error:", e);
       }
+      clearInterval(trimTimer);
 
       if (isStreaming) {
         setStatus("disconnected", "Stream ended");
         isStreaming = false;
-        streamReader = null;
+        streamAbort = null;
         updateUI();
         stopTelemetry();
         stopAmbient();
@@ -326,9 +340,10 @@
 
   function stopStream() {
     isStreaming = false;
-    if (streamReader) {
-      streamReader.cancel().catch(() => {});
-      streamReader = null;
+    clearInterval(trimInterval);
+    if (streamAbort) {
+      streamAbort.abort();
+      streamAbort = null;
     }
     const src = video.src;
     video.pause();
@@ -339,6 +354,7 @@
     updateUI();
     stopTelemetry();
     stopAmbient();
+    suspendAudio();
   }
 
   function togglePlay() {
@@ -378,7 +394,7 @@
       console.error("Video error:", err.code, err.message);
       setStatus("disconnected", "Stream error");
       isStreaming = false;
-      streamReader = null;
+      streamAbort = null;
       updateUI();
       stopTelemetry();
       stopAmbient();
@@ -410,14 +426,10 @@
   function updateUI() {
     const playing = isStreaming && !video.paused;
 
-    overlay.classList.toggle("overlay-hidden", isStreaming);
-    playIcon.classList.toggle("hidden", playing);
-    pauseIcon.classList.toggle("hidden", !playing);
-    liveBadge.style.display = isStreaming ? "flex" : "none";
-    offlineBadge.style.display = isStreaming ? "none" : "flex";
-    playerGlow.classList.toggle("player-glow-on", isStreaming);
-    playerGlow.classList.toggle("player-glow-off", !isStreaming);
-    liveDurationEl.classList.toggle("hidden", !isStreaming);
+    // Two attribute writes; player.css derives overlay, icons, badges,
+    // duration and glow from them in a single style recalc.
+    document.body.toggleAttribute("data-streaming", isStreaming);
+    document.body.toggleAttribute("data-playing", playing);
 
     if (playing) showControls();
     else {
@@ -487,8 +499,9 @@
     compressIcon.classList.toggle("hidden", !fs);
   }
 
-  document.addEventListener("fullscreenchange", updateFsIcon);
-  document.addEventListener("webkitfullscreenchange", updateFsIcon);
+  for (const type of ["fullscreenchange", "webkitfullscreenchange"]) {
+    document.addEventListener(type, updateFsIcon);
+  }
 
   // ── Events ──────────────────────────────────────────────
   // Overlay tap: always force-start (reset stuck state from failed autoplay)
@@ -502,25 +515,41 @@
   $("fsBtn").addEventListener("click", toggleFullscreen);
   volumeSlider.addEventListener("input", (e) => setVolume(e.target.value));
 
+  function nudgeVolume(delta) {
+    setVolume(Math.max(0, Math.min(100, volume + delta)));
+    volumeSlider.value = volume;
+  }
+
+  // Keyboard shortcuts — keys that would scroll the page are prevented
+  const KEYMAP = {
+    Space: (e) => { e.preventDefault(); togglePlay(); },
+    KeyM: () => toggleMute(),
+    KeyF: () => toggleFullscreen(),
+    ArrowUp: (e) => { e.preventDefault(); nudgeVolume(10); },
+    ArrowDown: (e) => { e.preventDefault(); nudgeVolume(-10); },
+  };
+
   document.addEventListener("keydown", (e) => {
-    if (e.code === "Space") {
-      e.preventDefault();
-      togglePlay();
-    } else if (e.code === "KeyM") toggleMute();
-    else if (e.code === "KeyF") toggleFullscreen();
-    else if (e.code === "ArrowUp") {
-      e.preventDefault();
-      setVolume(Math.min(100, volume + 10));
-      volumeSlider.value = volume;
-    } else if (e.code === "ArrowDown") {
-      e.preventDefault();
-      setVolume(Math.max(0, volume - 10));
-      volumeSlider.value = volume;
-    }
+    const action = KEYMAP[e.code];
+    if (action) action(e);
   });
 
   // Mouse / touch
-  playerWrapper.addEventListener("mousemove", showControls);
+  // mousemove can fire hundreds of times a second — coalesce to one
+  // showControls() per animation frame.
+  let moveQueued = false;
+  playerWrapper.addEventListener(
+    "mousemove",
+    () => {
+      if (moveQueued) return;
+      moveQueued = true;
+      requestAnimationFrame(() => {
+        moveQueued = false;
+        showControls();
+      });
+    },
+    { passive: true },
+  );
   playerWrapper.addEventListener("mouseleave", () => {
     if (isStreaming) controls.classList.remove("visible");
   });
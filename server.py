@@ -16,6 +16,7 @@ APP_MODULE = os.getenv("APP_MODULE", "main:app")  # module:app
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", 8000))
 RELOAD = os.getenv("RELOAD", "false").lower() in ("true", "1", "yes")
+ACCESS_LOG = os.getenv("ACCESS_LOG", "false").lower() in ("true", "1", "yes")
 
 
 class GracefulShutdown:
@@ -31,24 +32,24 @@ class GracefulShutdown:
     def handle_signal(self, signum, frame):
         """Handle shutdown signals gracefully."""
         sig_name = signal.Signals(signum).name
-        logger.info(f"Received {sig_name}, initiating graceful shutdown...")
+        logger.info("Received %s, initiating graceful shutdown...", sig_name)
         self.shutdown_requested = True
         
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self._cleanup())
+            # Signal handlers run on the main thread, between the loop's callbacks
+            asyncio.get_running_loop().create_task(self._cleanup())
+        except RuntimeError:
+            pass  # No loop running yet (or any more) — nothing to clean up
         except Exception as e:
-            logger.warning(f"Error during shutdown cleanup: {e}")
+            logger.warning("Error during shutdown cleanup: %s", e)
     
     async def _cleanup(self):
         """Clean up resources before shutdown."""
         try:
-            from services.broadcaster import broadcaster
             await broadcaster.stop()
             logger.info("Broadcaster stopped cleanly")
         except Exception as e:
-            logger.warning(f"Cleanup error: {e}")
+            logger.warning("Cleanup error: %s", e)
 
 
 shutdown_handler = GracefulShutdown()
@@ -70,4 +71,11 @@ if __name__ == "__main__":
         host=HOST,
         port=PORT,
         reload=RELOAD,
+        # "auto" already picks uvloop/httptools when installed (and falls back on Windows)
+        loop="auto",
+        http="auto",
+        lifespan="on",  # the broadcaster starts in lifespan.startup
+        access_log=ACCESS_LOG,
+        # Single worker: each worker process would spawn its own FFmpeg
+        workers=1,
     )
@@ -2,6 +2,8 @@
 Service modules for the streaming server.
 """
 
+import importlib
+
 from services.connection import (
     connection_manager,
     ConnectionManager,
@@ -13,10 +15,26 @@ from services.broadcaster import (
     ensure_broadcaster_running,
     BroadcasterState,
 )
-from services.handlers import (
-    HttpStreamHandler,
-    StatsHandler,
-)
+
+# Handlers load on first use, so importing a single service (server.py only
+# needs the broadcaster) doesn't pull them in. The connection and broadcaster
+# names stay eager: importing services.broadcaster binds the submodule as an
+# attribute here, which would shadow a lazily-resolved `broadcaster` instance.
+_LAZY_IMPORTS = {
+    "HttpStreamHandler": "services.handlers",
+    "StatsHandler": "services.handlers",
+}
+
+
+def __getattr__(name: str):
+    """Import lazily re-exported names on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Connection management
@@ -8,12 +8,15 @@ import asyncio
 import atexit
 import logging
 import os
+import re
 import signal
+import struct
 import sys
 import time
-from typing import Optional, Set
+from typing import Callable, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 
 from lib.config import config, SourceType
 from services.connection import connection_manager
@@ -21,6 +24,36 @@ from services.connection import connection_manager
 
 logger = logging.getLogger(__name__)
 
+# FFmpeg stdout pipe capacity (Linux): fewer blocked writes and wakeups than the 64 KiB default
+FFMPEG_PIPE_SIZE = 1 << 20
+
+# FFmpeg stderr lines logged as errors/warnings; everything else is debug
+_FFMPEG_ERROR_RE = re.compile(rb"error|fatal|failed|invalid", re.IGNORECASE)
+_FFMPEG_WARNING_RE = re.compile(rb"warning", re.IGNORECASE)
+
+# Block size for draining FFmpeg stderr
+STDERR_READ_SIZE = 16 * 1024
+
+# Grace period for FFmpeg to flush its muxer on SIGTERM before SIGKILL
+FFMPEG_TERM_TIMEOUT = 0.5
+
+# Return codes after _kill_process: killed by SIGTERM/SIGKILL, or FFmpeg's
+# own 255 when it catches SIGTERM and exits
+_STOP_RETURNCODES = frozenset({-signal.SIGTERM, -signal.SIGKILL, 255})
+
+# Media bytes are fanned out in batches of at least this size...
+BROADCAST_BATCH_BYTES = 64 * 1024
+# ...or after this long (seconds), whichever comes first. A fragment arrives
+# as one burst of pipe reads, so a short delay still coalesces it.
+BROADCAST_FLUSH_DELAY = 0.01
+
+# MP4 box header: 32-bit size + 4-char type (size 1 means a 64-bit size follows)
+_BOX_HEADER = struct.Struct(">I4s")
+_BOX_LARGESIZE = struct.Struct(">Q")
+
+# Top-level boxes that belong to the fMP4 init segment
+_INIT_BOX_TYPES = frozenset((b"ftyp", b"moov", b"free", b"skip"))
+
 # Track all FFmpeg process PIDs for cleanup on exit
 _ffmpeg_pids: Set[int] = set()
 
@@ -39,20 +72,62 @@ def _cleanup_ffmpeg_processes():
     _ffmpeg_pids.clear()
 
 
+def _load_prctl() -> Optional[Callable[..., int]]:
+    """Resolve libc's prctl once, in the parent (Linux only)."""
+    if sys.platform != "linux":
+        return None
+    try:
+        import ctypes
+        return ctypes.CDLL("libc.so.6", use_errno=True).prctl
+    except (OSError, AttributeError):
+        return None
+
+
+_prctl = _load_prctl()
+PR_SET_PDEATHSIG = 1
+
+
 def _make_child_die_with_parent():
     """Preexec function: ensure FFmpeg dies if the Python parent is killed.
     
     On Linux: uses prctl PR_SET_PDEATHSIG so the kernel sends SIGKILL.
-    On macOS: sets process group so atexit can kill the group.
+    Elsewhere the atexit cleanup above is the safety net.
+    
+    Runs in the forked child, so it only makes the call — libc was loaded
+    and prctl resolved at import rather than in every child.
     """
-    if sys.platform == "linux":
-        try:
-            import ctypes
-            PR_SET_PDEATHSIG = 1
-            libc = ctypes.CDLL("libc.so.6")
-            libc.prctl(PR_SET_PDEATHSIG, signal.SIGKILL)
-        except Exception:
-            pass
+    _prctl(PR_SET_PDEATHSIG, signal.SIGKILL)
+
+
+def _ffmpeg_preexec(nice: int) -> Optional[Callable[[], None]]:
+    """Build the preexec function for FFmpeg, or None if the child needs no setup.
+    
+    A positive ``nice`` lowers FFmpeg's priority so the encoder yields the CPU
+    to the event loop that feeds clients. It is applied before exec so every
+    encoder thread inherits it.
+    """
+    if _prctl is None and not nice:
+        return None
+    
+    def preexec() -> None:
+        if _prctl is not None:
+            _make_child_die_with_parent()
+        if nice:
+            os.nice(nice)
+    
+    return preexec
+
+
+def _grow_pipe(fd: int) -> None:
+    """Enlarge a pipe's kernel buffer to FFMPEG_PIPE_SIZE where supported."""
+    if sys.platform != "linux":
+        return
+    import fcntl
+    try:
+        fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, FFMPEG_PIPE_SIZE)
+    except OSError as e:
+        # EPERM above /proc/sys/fs/pipe-max-size for unprivileged users
+        logger.debug("Could not enlarge FFmpeg pipe: %s", e)
 
 
 # Register cleanup handler
@@ -68,7 +143,7 @@ class BroadcasterState(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamStats:
     """Statistics for the fMP4 broadcast stream."""
     start_time: float = field(default_factory=time.time)
@@ -80,6 +155,30 @@ class StreamStats:
         return time.time() - self.start_time
 
 
+class _PipeReader(asyncio.Protocol):
+    """Protocol for FFmpeg's stdout pipe.
+    
+    Hands each chunk to ``on_chunk`` exactly as the transport read it —
+    no StreamReader buffer in between, so no extra copy per chunk.
+    ``closed`` resolves when the pipe closes (FFmpeg exited or was killed).
+    """
+    
+    def __init__(self, on_chunk: Callable[[bytes], None]):
+        self.on_chunk = on_chunk
+        self.closed: asyncio.Future = asyncio.get_running_loop().create_future()
+    
+    def data_received(self, data: bytes) -> None:
+        self.on_chunk(data)
+    
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self.closed.done():
+            return
+        if exc is None:
+            self.closed.set_result(None)
+        else:
+            self.closed.set_exception(exc)
+
+
 class MediaBroadcaster:
     """
     Singleton service that broadcasts video+audio as fragmented MP4.
@@ -154,13 +253,16 @@ class MediaBroadcaster:
                 quality_info = f"CRF: {self._video_config.crf}"
             
             logger.info(
-                f"Broadcaster started - source: {self._video_config.file_path} "
-                f"(type: {source_type.name}, live: {self._video_config.is_live_source}, "
-                f"loop: {self._video_config.can_loop}, {quality_info})"
+                "Broadcaster started - source: %s (type: %s, live: %s, loop: %s, %s)",
+                self._video_config.file_path,
+                source_type.name,
+                self._video_config.is_live_source,
+                self._video_config.can_loop,
+                quality_info,
             )
             return True
         except Exception as e:
-            logger.error(f"Failed to start broadcaster: {e}")
+            logger.error("Failed to start broadcaster: %s", e)
             self._state = BroadcasterState.ERROR
             return False
     
@@ -188,28 +290,41 @@ class MediaBroadcaster:
         logger.info("Broadcaster stopped")
     
     async def _kill_process(self) -> None:
-        """Terminate the FFmpeg process. Uses SIGKILL for reliability."""
-        if self._process and self._process.returncode is None:
-            pid = self._process.pid
+        """Terminate the FFmpeg process.
+
+        Sends SIGTERM first so FFmpeg can flush the muxer, and escalates to
+        SIGKILL if it has not exited within FFMPEG_TERM_TIMEOUT.
+        """
+        # Bind once: stop() and the broadcast cycle's finally can both be in
+        # here, and either may reset self._process while the other awaits
+        process = self._process
+        if process is not None and process.returncode is None:
+            pid = process.pid
             try:
-                self._process.kill()
+                process.terminate()
                 try:
-                    await asyncio.wait_for(self._process.wait(), timeout=3.0)
-                    logger.debug(f"FFmpeg process killed (PID {pid})")
+                    await asyncio.wait_for(process.wait(), timeout=FFMPEG_TERM_TIMEOUT)
+                    logger.debug("FFmpeg process terminated (PID %s)", pid)
                 except asyncio.TimeoutError:
-                    logger.warning(f"FFmpeg PID {pid} didn't die, force killing via OS")
+                    process.kill()
                     try:
-                        os.kill(pid, signal.SIGKILL)
-                    except (ProcessLookupError, OSError):
-                        pass
+                        await asyncio.wait_for(process.wait(), timeout=3.0)
+                        logger.debug("FFmpeg process killed (PID %s)", pid)
+                    except asyncio.TimeoutError:
+                        logger.warning("FFmpeg PID %s didn't die, force killing via OS", pid)
+                        try:
+                            os.kill(pid, signal.SIGKILL)
+                        except (ProcessLookupError, OSError):
+                            pass
             except ProcessLookupError:
                 pass
             except Exception as e:
-                logger.debug(f"Error stopping FFmpeg process: {e}")
+                logger.debug("Error stopping FFmpeg process: %s", e)
             finally:
                 _ffmpeg_pids.discard(pid)
         
-        self._process = None
+        if self._process is process:
+            self._process = None
     
     async def _broadcast_loop(self) -> None:
         """Main broadcast loop that manages the FFmpeg process."""
@@ -227,14 +342,18 @@ class MediaBroadcaster:
                     restart_delay = 1.0
                 else:
                     # Short cycle = FFmpeg failed quickly, increase backoff
-                    logger.warning(f"FFmpeg exited after {cycle_duration:.1f}s, restarting in {restart_delay:.0f}s...")
+                    logger.warning(
+                        "FFmpeg exited after %.1fs, restarting in %.0fs...",
+                        cycle_duration,
+                        restart_delay,
+                    )
                     await asyncio.sleep(restart_delay)
                     restart_delay = min(restart_delay * 2, 30.0)
                     
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Broadcast cycle error: {e}")
+                logger.error("Broadcast cycle error: %s", e)
                 await asyncio.sleep(restart_delay)
                 restart_delay = min(restart_delay * 2, 30.0)
         
@@ -244,22 +363,35 @@ class MediaBroadcaster:
         """Run one broadcast cycle: start FFmpeg, read chunks, broadcast."""
         self._stats = StreamStats()
         
-        self._process = await self._create_ffmpeg_process()
+        self._process, stdout_fd = await self._create_ffmpeg_process()
         pid = self._process.pid
         
         try:
-            await self._read_and_broadcast(self._process)
+            await self._read_and_broadcast(stdout_fd)
         finally:
             rc = self._process.returncode if self._process else None
-            if rc is not None and rc != 0 and rc != -9:  # -9 = SIGKILL (normal shutdown)
-                logger.warning(f"FFmpeg (PID {pid}) exited with code {rc}")
+            # Exits caused by our own stop signals are not worth a warning
+            if (
+                rc is not None
+                and rc != 0
+                and rc not in _STOP_RETURNCODES
+                and not self._shutdown_event.is_set()
+            ):
+                logger.warning("FFmpeg (PID %s) exited with code %s", pid, rc)
             await self._kill_process()
     
-    def _build_input_args(self) -> list[str]:
-        """Build FFmpeg input arguments based on source type."""
+    @cached_property
+    def _input_args(self) -> tuple[str, ...]:
+        """FFmpeg input arguments for the source.
+        
+        Parsed once: the video config is frozen, so FFmpeg restarts reuse them.
+        """
         args = []
         source_type = self._video_config.source_type
         path = self._video_config.file_path
+        # Lowercase once (and skip the copy when already lowercase)
+        path_lower = path if path.islower() else path.lower()
+        is_http = path_lower.startswith(("http://", "https://"))
         
         # Add pacing flag to match real-time playback speed.
         # Without -re, FFmpeg processes as fast as possible — for remote HTTP
@@ -268,7 +400,7 @@ class MediaBroadcaster:
         # produce data at real-time.
         if not self._video_config.is_live_source:
             args.extend(["-re"])
-        elif path.lower().startswith(("http://", "https://")):
+        elif is_http:
             # Remote HTTP video files download faster than real-time
             # and need pacing to prevent fast-forward and FFmpeg restart storms
             args.extend(["-re"])
@@ -277,7 +409,7 @@ class MediaBroadcaster:
         # This prevents FFmpeg from exiting and restarting (which resets position)
         if self._video_config.can_loop:
             args.extend(["-stream_loop", "-1"])
-        elif path.lower().startswith(("http://", "https://")):
+        elif is_http:
             args.extend(["-stream_loop", "-1"])
         
         # Add format specifier and options for devices
@@ -293,11 +425,11 @@ class MediaBroadcaster:
                 args.extend(["-framerate", str(self._video_config.fps)])
         
         # Add RTSP transport options for reliability
-        if source_type == SourceType.LIVE_STREAM and path.lower().startswith("rtsp://"):
+        if source_type == SourceType.LIVE_STREAM and path_lower.startswith("rtsp://"):
             args.extend(["-rtsp_transport", "tcp"])
         
         # HTTP/HTTPS source options: User-Agent and reconnect resilience
-        if source_type == SourceType.LIVE_STREAM and path.lower().startswith(("http://", "https://")):
+        if source_type == SourceType.LIVE_STREAM and is_http:
             args.extend([
                 "-user_agent",
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -309,7 +441,7 @@ class MediaBroadcaster:
             ])
         
         args.extend(["-i", path])
-        return args
+        return tuple(args)
     
     def _build_video_filter_args(self) -> list[str]:
         """Build FFmpeg video filter args for scaling."""
@@ -325,30 +457,24 @@ class MediaBroadcaster:
                 w, h = self._video_config.resolution.lower().split("x")
                 args.extend(["-vf", f"scale={w}:{h}"])
             except ValueError:
-                logger.warning(f"Invalid VIDEO_RESOLUTION '{self._video_config.resolution}', using original")
+                logger.warning(
+                    "Invalid VIDEO_RESOLUTION '%s', using original",
+                    self._video_config.resolution,
+                )
         return args
     
-    async def _create_ffmpeg_process(self) -> asyncio.subprocess.Process:
-        """Create single FFmpeg process outputting fragmented MP4.
-        
-        Output format: fMP4 with H.264 video + AAC audio
-        - empty_moov: init segment at the start (no seek needed)
-        - frag_keyframe: new fragment at each keyframe
-        - default_base_moof: required for browser compatibility
-        
-        Uses libx264 software encoding (ultrafast preset) for maximum
-        compatibility across all platforms.
-        """
-        input_args = self._build_input_args()
+    @cached_property
+    def _ffmpeg_cmd(self) -> tuple[str, ...]:
+        """Full FFmpeg command line, built once and reused on every restart."""
         video_filter_args = self._build_video_filter_args()
         crf = self._video_config.effective_crf
         fps = self._video_config.fps
         audio_bitrate = self._video_config.audio_bitrate
         
-        cmd = [
+        return (
             "ffmpeg",
             "-hide_banner",
-            *input_args,
+            *self._input_args,
             # Video: H.264 Baseline profile for widest browser support
             # - level 3.1 supports up to 1080p@30fps (level 3.0 caps at 720p)
             # - yuv420p pixel format required by all mobile decoders
@@ -372,45 +498,89 @@ class MediaBroadcaster:
             "-movflags", "frag_keyframe+empty_moov+default_base_moof",
             "-frag_duration", "500000",  # Fragment every 500ms for smooth streaming
             "pipe:1",
-        ]
-        
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,  # Capture stderr for logging
-            preexec_fn=_make_child_die_with_parent,
         )
+    
+    async def _create_ffmpeg_process(self) -> Tuple[asyncio.subprocess.Process, int]:
+        """Create single FFmpeg process outputting fragmented MP4.
+        
+        Output format: fMP4 with H.264 video + AAC audio
+        - empty_moov: init segment at the start (no seek needed)
+        - frag_keyframe: new fragment at each keyframe
+        - default_base_moof: required for browser compatibility
+        
+        Uses libx264 software encoding (ultrafast preset) for maximum
+        compatibility across all platforms.
+        
+        Returns the process and the read end of its stdout pipe.
+        """
+        # stdout is a raw pipe read by _PipeReader rather than a StreamReader
+        stdout_fd, child_stdout_fd = os.pipe()
+        _grow_pipe(stdout_fd)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._ffmpeg_cmd,
+                stdout=child_stdout_fd,
+                stderr=asyncio.subprocess.PIPE,  # Capture stderr for logging
+                # Without a preexec_fn, subprocess can take its faster spawn path
+                preexec_fn=_ffmpeg_preexec(self._video_config.ffmpeg_nice),
+            )
+        except BaseException:
+            os.close(stdout_fd)
+            raise
+        finally:
+            os.close(child_stdout_fd)  # FFmpeg holds its own copy
         _ffmpeg_pids.add(process.pid)
         
         # Start background task to log FFmpeg stderr
         asyncio.create_task(self._log_ffmpeg_stderr(process))
         
-        logger.info(f"FFmpeg started (PID {process.pid}) — fMP4 output (H.264 CRF={crf}, AAC {audio_bitrate})")
-        return process
+        logger.info(
+            "FFmpeg started (PID %s) — fMP4 output (H.264 CRF=%s, AAC %s)",
+            process.pid,
+            self._video_config.effective_crf,
+            self._video_config.audio_bitrate,
+        )
+        return process, stdout_fd
     
     async def _log_ffmpeg_stderr(self, process: asyncio.subprocess.Process) -> None:
         """Read and log FFmpeg stderr output for diagnostics."""
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        def log_line(line: bytes) -> None:
+            # Classify on the raw bytes; only decode lines that get logged
+            if _FFMPEG_ERROR_RE.search(line):
+                level = logging.ERROR
+            elif _FFMPEG_WARNING_RE.search(line):
+                level = logging.WARNING
+            elif debug:
+                level = logging.DEBUG
+            else:
+                return
+            text = line.decode("utf-8", errors="replace").rstrip()
+            if text:
+                logger.log(level, "FFmpeg: %s", text)
+
+        pending = b""
         try:
             while True:
-                line = await process.stderr.readline()
-                if not line:
+                data = await process.stderr.read(STDERR_READ_SIZE)
+                if not data:
                     break
-                text = line.decode("utf-8", errors="replace").rstrip()
-                if not text:
-                    continue
-                # Log errors/warnings prominently, other lines as debug
-                lower = text.lower()
-                if any(w in lower for w in ("error", "fatal", "failed", "invalid")):
-                    logger.error(f"FFmpeg: {text}")
-                elif "warning" in lower:
-                    logger.warning(f"FFmpeg: {text}")
-                else:
-                    logger.debug(f"FFmpeg: {text}")
+                # splitlines() also breaks on the \r FFmpeg uses for progress lines
+                lines = (pending + data).splitlines()
+                pending = b"" if data[-1:] in b"\r\n" else lines.pop()
+                if len(pending) > STDERR_READ_SIZE:
+                    lines.append(pending)
+                    pending = b""
+                for line in lines:
+                    log_line(line)
+            if pending:
+                log_line(pending)
         except (asyncio.CancelledError, Exception):
             pass
     
     @staticmethod
-    def _find_init_end(data: bytes) -> int:
+    def _find_init_end(data: Union[bytes, bytearray]) -> int:
         """Find the byte offset where the init segment ends.
         
         Walks MP4 top-level boxes (ftyp, moov, free, skip) and returns
@@ -418,15 +588,22 @@ class MediaBroadcaster:
         Returns -1 if we haven't received enough data yet.
         """
         pos = 0
-        while pos + 8 <= len(data):
-            box_size = int.from_bytes(data[pos:pos + 4], 'big')
-            box_type = data[pos + 4:pos + 8]
+        end = len(data)
+        while pos + 8 <= end:
+            box_size, box_type = _BOX_HEADER.unpack_from(data, pos)
             
-            if box_size < 8:
+            if box_size == 1:
+                # 64-bit largesize right after the type
+                if pos + 16 > end:
+                    return -1  # Need more data
+                (box_size,) = _BOX_LARGESIZE.unpack_from(data, pos + 8)
+                if box_size < 16:
+                    return -1  # Invalid box
+            elif box_size < 8:
                 return -1  # Invalid box, need more data
             
             # Init boxes: ftyp, moov, free, skip
-            if box_type in (b'ftyp', b'moov', b'free', b'skip'):
+            if box_type in _INIT_BOX_TYPES:
                 pos += box_size
             else:
                 # First non-init box found (moof, mdat, etc.)
@@ -434,7 +611,7 @@ class MediaBroadcaster:
         
         return -1  # Need more data
     
-    async def _read_and_broadcast(self, process: asyncio.subprocess.Process) -> None:
+    async def _read_and_broadcast(self, stdout_fd: int) -> None:
         """Read fMP4 from FFmpeg and broadcast to all clients.
         
         Two phases:
@@ -446,42 +623,78 @@ class MediaBroadcaster:
         server-side buffering delay and ensures continuous data delivery. Combined
         with 'sequence' mode on the client, this is immune to timestamp resets
         when the source video loops (-stream_loop -1).
+        
+        Chunks are pushed by the pipe transport as soon as they're read, so
+        this just waits for the pipe to close. Small reads are coalesced into
+        BROADCAST_BATCH_BYTES batches (or flushed after BROADCAST_FLUSH_DELAY)
+        so each client queue sees fewer, larger chunks.
         """
-        init_captured = False
-        init_buf = b""
+        loop = asyncio.get_running_loop()
+        init_buf = bytearray()
+        pending: list[bytes] = []
+        pending_size = 0
+        flush_handle: Optional[asyncio.TimerHandle] = None
         
-        while not self._shutdown_event.is_set():
-            try:
-                chunk = await process.stdout.read(16384)  # 16KB for frequent delivery
-                if not chunk:
-                    break
-            except (Exception, asyncio.CancelledError):
-                break
-            
+        # Per-chunk callbacks: bind lookups to locals once
+        stats = self._stats
+        broadcast = connection_manager.broadcast
+        
+        def flush() -> None:
+            nonlocal pending_size, flush_handle
+            if flush_handle is not None:
+                flush_handle.cancel()
+                flush_handle = None
+            if not pending:
+                return
+            batch = pending[0] if len(pending) == 1 else b"".join(pending)
+            pending.clear()
+            pending_size = 0
+            stats.chunks_sent += 1
+            stats.bytes_sent += len(batch)
+            broadcast(batch)
+        
+        def stream(chunk: bytes) -> None:
+            # Phase 2: Stream raw bytes — SourceBuffer (sequence mode) handles parsing
+            nonlocal pending_size, flush_handle
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= BROADCAST_BATCH_BYTES:
+                flush()
+            elif flush_handle is None:
+                flush_handle = loop.call_later(BROADCAST_FLUSH_DELAY, flush)
+        
+        def capture_init(chunk: bytes) -> None:
             # Phase 1: Capture the init segment (ftyp + moov)
-            if not init_captured:
-                init_buf += chunk
-                init_end = self._find_init_end(init_buf)
-                
-                if init_end > 0:
-                    # Init segment is complete — cache it for new clients
-                    connection_manager.set_init_segment(init_buf[:init_end])
-                    logger.info(f"Init segment captured ({init_end} bytes)")
-                    init_captured = True
-                    
-                    # Any leftover bytes after init are media data — send them
-                    leftover = init_buf[init_end:]
-                    if leftover:
-                        self._stats.chunks_sent += 1
-                        self._stats.bytes_sent += len(leftover)
-                        connection_manager.broadcast(leftover)
-                    init_buf = b""  # Free memory
-                continue
+            init_buf.extend(chunk)  # amortised append, not a copy of the prefix
+            init_end = self._find_init_end(init_buf)
             
-            # Phase 2: Stream raw bytes — SourceBuffer (sequence mode) handles parsing
-            self._stats.chunks_sent += 1
-            self._stats.bytes_sent += len(chunk)
-            connection_manager.broadcast(chunk)
+            if init_end > 0:
+                # Init segment is complete — cache it for new clients
+                connection_manager.set_init_segment(bytes(init_buf[:init_end]))
+                logger.info("Init segment captured (%s bytes)", init_end)
+                reader.on_chunk = stream
+                
+                # Any leftover bytes after init are media data — send them
+                leftover = bytes(init_buf[init_end:])
+                init_buf.clear()  # Free memory
+                if leftover:
+                    stream(leftover)
+        
+        reader = _PipeReader(capture_init)
+        pipe = os.fdopen(stdout_fd, "rb", buffering=0)
+        try:
+            transport, _ = await loop.connect_read_pipe(
+                lambda: reader, pipe
+            )
+        except BaseException:
+            pipe.close()
+            raise
+        
+        try:
+            await reader.closed
+        finally:
+            transport.close()
+            flush()  # Deliver whatever FFmpeg wrote last
 
 
 # Global broadcaster instance
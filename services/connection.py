@@ -4,46 +4,56 @@ Handles efficient tracking and cleanup of client connections.
 """
 
 import asyncio
+import itertools
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Any
+from typing import Deque, Dict, Optional, Any, Tuple
 import logging
 import time
 
 
 logger = logging.getLogger(__name__)
 
+# Client ids: small, never reused (unlike id() of a collected queue)
+_client_ids = itertools.count(1)
 
-@dataclass
+
+@dataclass(slots=True)
 class ClientStats:
-    """Statistics for a single client connection."""
+    """Statistics for a single client connection (updated by ClientQueue.put_nowait)."""
     connected_at: float = field(default_factory=time.time)
     chunks_sent: int = 0
     bytes_sent: int = 0
     chunks_dropped: int = 0  # Backpressure tracking
     last_activity: float = field(default_factory=time.time)
-    
-    def update(self, bytes_count: int) -> None:
-        """Update stats after sending data."""
-        self.chunks_sent += 1
-        self.bytes_sent += bytes_count
-        self.last_activity = time.time()
-    
-    def record_drop(self) -> None:
-        """Record a dropped chunk due to backpressure."""
-        self.chunks_dropped += 1
 
 
 class ClientQueue:
     """
-    Wrapper around asyncio.Queue with backpressure and stats tracking.
-    Each HTTP streaming client gets one queue for muxed fMP4 chunks.
+    Bounded chunk buffer with backpressure and stats tracking.
+    Each HTTP streaming client gets one queue for muxed fMP4 chunks, held as
+    ready-to-send ASGI body messages shared by every client.
+    
+    Single producer (the broadcaster) and single consumer (the client's
+    response loop), so a deque plus one Event replaces asyncio.Queue and
+    its per-operation getter/putter futures.
+    
+    The backlog is bounded both by message count (``maxsize``) and by bytes
+    (``max_bytes``): broadcast batch sizes vary with the stream bitrate, so
+    the byte budget is what actually caps a slow client's memory and delay.
     """
     
-    def __init__(self, maxsize: int = 4):
-        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    __slots__ = ("_buffer", "_ready", "_stats", "_active", "_id", "_max_bytes", "_buffered_bytes")
+    
+    def __init__(self, maxsize: int = 4, max_bytes: int = 0):
+        # maxsize / max_bytes <= 0 mean unbounded, as with asyncio.Queue
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=maxsize if maxsize > 0 else None)
+        self._max_bytes = max(max_bytes, 0)
+        self._buffered_bytes = 0
+        self._ready = asyncio.Event()
         self._stats = ClientStats()
         self._active = True
-        self._id = id(self)
+        self._id = next(_client_ids)
     
     @property
     def id(self) -> int:
@@ -57,57 +67,90 @@ class ClientQueue:
     def is_active(self) -> bool:
         return self._active
     
-    def put_nowait(self, item: bytes) -> bool:
+    def put_nowait(self, message: Dict[str, Any], now: Optional[float] = None) -> bool:
         """
         Put item in queue, dropping OLDEST if full (ring buffer backpressure).
         Returns True if successful, False if client is inactive.
         
         Unlike draining the whole queue, this only drops one item at a time
         to maintain continuous segment delivery for fMP4 streaming.
+        ``now`` lets a caller fanning out one chunk read the clock once.
         """
         if not self._active:
             return False
-            
-        try:
-            # Only drop if queue is full — keep as many segments as possible
-            if self._queue.full():
-                try:
-                    self._queue.get_nowait()
-                    self._stats.chunks_dropped += 1
-                except asyncio.QueueEmpty:
-                    pass
-            
-            self._queue.put_nowait(item)
-            self._stats.update(len(item))
-            return True
-        except Exception:
-            return False
+        
+        # Only drop if queue is full — keep as many segments as possible.
+        # A full bounded deque discards its oldest item on append.
+        buffer = self._buffer
+        stats = self._stats
+        size = len(message["body"])
+        buffered = self._buffered_bytes + size
+        if len(buffer) == buffer.maxlen:
+            buffered -= len(buffer[0]["body"])
+            stats.chunks_dropped += 1
+        buffer.append(message)
+        # Over the byte budget: drop oldest as well, but always keep the newest
+        max_bytes = self._max_bytes
+        if max_bytes:
+            while buffered > max_bytes and len(buffer) > 1:
+                buffered -= len(buffer.popleft()["body"])
+                stats.chunks_dropped += 1
+        self._buffered_bytes = buffered
+        self._ready.set()
+        # Stats are updated in place here: this runs per chunk per client
+        stats.chunks_sent += 1
+        stats.bytes_sent += size
+        stats.last_activity = time.time() if now is None else now
+        return True
     
-    async def get(self, timeout: float = 5.0) -> Optional[bytes]:
-        """Get item from queue with timeout."""
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Get the next body message, waiting until one arrives or the queue is closed.
+        
+        If several messages are queued (the client fell behind), they are
+        merged into one so the backlog goes out in a single send().
+        Returns None once closed, or if ``timeout`` is given and expires first.
+        Without a timeout no timer is armed per wait.
+        """
         if not self._active:
             return None
-            
-        try:
-            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
-        except asyncio.TimeoutError:
-            return None
-        except Exception:
-            return None
+        
+        if not self._buffer:
+            self._ready.clear()
+            if timeout is None:
+                await self._ready.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    return None
+            if not self._buffer:
+                return None  # Woken by close()
+        
+        buffer = self._buffer
+        self._buffered_bytes = 0  # either branch below empties the buffer
+        if len(buffer) == 1:
+            return buffer.popleft()
+        body = b"".join([message["body"] for message in buffer])
+        buffer.clear()
+        return {"type": "http.response.body", "body": body, "more_body": True}
     
     def close(self) -> None:
-        """Mark this queue as closed."""
+        """Mark this queue as closed (and wake a waiting get())."""
         self._active = False
+        self._ready.set()
     
     def qsize(self) -> int:
         """Get current queue size."""
-        return self._queue.qsize()
+        return len(self._buffer)
 
 
 class ConnectionManager:
     """
     Manages HTTP streaming client connections for fMP4 streaming.
     
+    Not thread-safe: all methods must be called from the event loop thread,
+    which already serializes them (none of them await while mutating state).
+    
     Features:
     - Single client type (muxed audio+video chunks)
     - Caches fMP4 init segment for new clients
@@ -115,24 +158,12 @@ class ConnectionManager:
     - Connection statistics and monitoring
     """
     
-    _instance: Optional["ConnectionManager"] = None
-    
-    def __new__(cls) -> "ConnectionManager":
-        """Singleton pattern for global connection management."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self):
-        if self._initialized:
-            return
-            
         self._clients: Dict[int, ClientQueue] = {}
-        self._lock = asyncio.Lock()
+        # Immutable copy of the clients for broadcast(); rebuilt only on membership changes
+        self._clients_snapshot: Tuple[ClientQueue, ...] = ()
         self._max_clients: int = 100
         self._init_segment: Optional[bytes] = None
-        self._initialized = True
         
         logger.info("ConnectionManager initialized")
     
@@ -148,60 +179,73 @@ class ConnectionManager:
     def set_init_segment(self, data: bytes) -> None:
         """Cache the fMP4 init segment for new clients."""
         self._init_segment = data
-        logger.debug(f"Init segment cached ({len(data)} bytes)")
+        logger.debug("Init segment cached (%s bytes)", len(data))
     
     def set_max_clients(self, max_clients: int) -> None:
         """Set maximum number of allowed clients."""
         self._max_clients = max_clients
     
-    async def register_client(self, maxsize: int = 4) -> Optional[ClientQueue]:
+    async def register_client(self, maxsize: int = 4, max_bytes: int = 0) -> Optional[ClientQueue]:
         """Register a new streaming client."""
-        async with self._lock:
-            if self.client_count >= self._max_clients:
-                logger.warning(f"Max clients ({self._max_clients}) reached, rejecting connection")
-                return None
-            
-            client = ClientQueue(maxsize=maxsize)
-            self._clients[client.id] = client
-            
-            logger.debug(f"Registered client {client.id} (total: {self.client_count})")
-            return client
+        if self.client_count >= self._max_clients:
+            logger.warning("Max clients (%s) reached, rejecting connection", self._max_clients)
+            return None
+        
+        client = ClientQueue(maxsize=maxsize, max_bytes=max_bytes)
+        self._clients[client.id] = client
+        self._refresh_snapshot()
+        
+        logger.debug("Registered client %s (total: %s)", client.id, self.client_count)
+        return client
     
     async def unregister_client(self, client: ClientQueue) -> None:
         """Unregister a client connection."""
-        async with self._lock:
-            client.close()
-            self._clients.pop(client.id, None)
-            
+        client.close()
+        self._clients.pop(client.id, None)
+        self._refresh_snapshot()
+        
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Unregistered client {client.id} "
-                f"(sent {client.stats.chunks_sent} chunks, {client.stats.bytes_sent} bytes, "
-                f"total: {self.client_count})"
+                "Unregistered client %s (sent %s chunks, %s bytes, total: %s)",
+                client.id,
+                client.stats.chunks_sent,
+                client.stats.bytes_sent,
+                self.client_count,
             )
     
+    def _refresh_snapshot(self) -> None:
+        """Rebuild the client tuple iterated by broadcast()."""
+        self._clients_snapshot = tuple(self._clients.values())
+    
     def broadcast(self, chunk: bytes) -> int:
         """
         Broadcast fMP4 chunk to all connected clients.
         Returns number of clients that received the chunk.
+        
+        The ASGI message is built once and shared: send() never mutates it.
         """
+        message = {"type": "http.response.body", "body": chunk, "more_body": True}
         sent_count = 0
         dead_clients = []
+        now = time.time()  # one clock read for the whole fan-out
         
-        for client_id, client in self._clients.items():
-            if client.put_nowait(chunk):
+        for client in self._clients_snapshot:
+            if client.put_nowait(message, now):
                 sent_count += 1
             else:
-                dead_clients.append(client_id)
+                dead_clients.append(client)
         
-        for client_id in dead_clients:
-            self._clients.pop(client_id, None)
+        if dead_clients:
+            for client in dead_clients:
+                self._clients.pop(client.id, None)
+            self._refresh_snapshot()
         
         return sent_count
     
     def get_stats(self) -> Dict[str, Any]:
         """Get connection statistics including backpressure metrics."""
         total_dropped = sum(
-            c.stats.chunks_dropped for c in self._clients.values()
+            c.stats.chunks_dropped for c in self._clients_snapshot
         )
         
         return {
@@ -216,19 +260,20 @@ class ConnectionManager:
         Clean up clients that have been inactive for too long.
         Returns number of clients removed.
         """
-        async with self._lock:
-            current_time = time.time()
-            dead = [
-                cid for cid, client in self._clients.items()
-                if current_time - client.stats.last_activity > timeout
-            ]
-            for cid in dead:
-                self._clients.pop(cid, None)
-            
-            if dead:
-                logger.info(f"Cleaned up {len(dead)} inactive clients")
-            
-            return len(dead)
+        current_time = time.time()
+        dead = [
+            cid for cid, client in self._clients.items()
+            if current_time - client.stats.last_activity > timeout
+        ]
+        for cid in dead:
+            self._clients.pop(cid, None)
+        
+        if dead:
+            self._refresh_snapshot()
+            logger.info("Cleaned up %s inactive clients", len(dead))
+        
+        return len(dead)
 
 
+# The process-wide instance; import this rather than constructing a new one
 connection_manager = ConnectionManager()
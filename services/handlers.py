@@ -6,12 +6,18 @@ HTTP stream handler for fMP4 video, stats endpoint.
 import asyncio
 import json
 import logging
+import time
 from typing import Any, Callable, Awaitable, Dict, List, Tuple
 
 from lib.config import config
 from services.connection import connection_manager
 from services.broadcaster import broadcaster
 
+try:
+    import orjson  # Optional: faster /stats encoding when installed
+except ImportError:
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +29,55 @@ Send = Callable[[Dict[str, Any]], Awaitable[None]]
 Headers = List[Tuple[bytes, bytes]]
 
 
+# How long a serialized /stats response is reused (seconds)
+STATS_TTL = 0.5
+
+# Fixed part of every /stats response; only content-length varies
+STATS_HEADERS: Headers = [
+    (b"content-type", b"application/json"),
+    (b"cache-control", b"no-store"),
+    (b"access-control-allow-origin", b"*"),
+]
+
+
+# /stream response start — no Content-Length means chunked/streaming
+STREAM_START_MESSAGE: Dict[str, Any] = {
+    "type": "http.response.start",
+    "status": 200,
+    "headers": [
+        (b"content-type", b"video/mp4"),
+        (b"cache-control", b"no-cache, no-store"),
+        (b"access-control-allow-origin", b"*"),
+    ],
+}
+
+# Prebuilt 503 for streams rejected at capacity
+CAPACITY_BODY = b"Server at capacity, try again later"
+CAPACITY_START_MESSAGE: Dict[str, Any] = {
+    "type": "http.response.start",
+    "status": 503,
+    "headers": [
+        (b"content-type", b"text/plain"),
+        (b"content-length", str(len(CAPACITY_BODY)).encode()),
+    ],
+}
+CAPACITY_BODY_MESSAGE: Dict[str, Any] = {"type": "http.response.body", "body": CAPACITY_BODY}
+
+
+def _dump_json(data: Dict[str, Any]) -> bytes:
+    """Encode a JSON document (indented, for humans polling /stats)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
 class HttpStreamHandler:
     """Handler for HTTP fMP4 video streaming.
     
     Protocol:
     1. Client requests GET /stream
     2. Server responds with Content-Type: video/mp4 (no Content-Length = streaming)
-    3. Server sends cached init segment (ftyp + moov)
+    3. Server sends cached init segment (ftyp + moov) with the first media chunk
     4. Server streams fMP4 media chunks (moof + mdat) as HTTP response body
     5. Connection stays open until client disconnects
     
@@ -42,33 +90,18 @@ class HttpStreamHandler:
         """Handle HTTP stream request."""
         # Register client with backpressure queue
         client = await connection_manager.register_client(
-            maxsize=config.video.chunk_buffer_size
+            maxsize=config.video.chunk_buffer_size,
+            max_bytes=config.video.client_buffer_bytes,
         )
         
         if client is None:
             # Server full — return 503
-            body = b"Server at capacity, try again later"
-            await send({
-                "type": "http.response.start",
-                "status": 503,
-                "headers": [
-                    (b"content-type", b"text/plain"),
-                    (b"content-length", str(len(body)).encode()),
-                ],
-            })
-            await send({"type": "http.response.body", "body": body})
+            await send(CAPACITY_START_MESSAGE)
+            await send(CAPACITY_BODY_MESSAGE)
             return
         
         # Send response headers — no Content-Length means chunked/streaming
-        await send({
-            "type": "http.response.start",
-            "status": 200,
-            "headers": [
-                (b"content-type", b"video/mp4"),
-                (b"cache-control", b"no-cache, no-store"),
-                (b"access-control-allow-origin", b"*"),
-            ],
-        })
+        await send(STREAM_START_MESSAGE)
         
         # Wait for init segment (broadcaster might still be starting)
         init = connection_manager.init_segment
@@ -84,49 +117,38 @@ class HttpStreamHandler:
             await send({"type": "http.response.body", "body": b"", "more_body": False})
             return
         
-        # Send init segment (ftyp + moov) — browser needs this first
-        try:
-            await send({
-                "type": "http.response.body",
-                "body": init,
-                "more_body": True,
-            })
-        except Exception:
-            await connection_manager.unregister_client(client)
-            return
-        
-        # Monitor for client disconnect
-        disconnect_event = asyncio.Event()
-        
+        # Monitor for client disconnect; closing the queue wakes the send loop
         async def watch_disconnect():
             try:
                 while True:
                     msg = await receive()
                     if msg["type"] == "http.disconnect":
-                        disconnect_event.set()
                         return
             except (asyncio.CancelledError, Exception):
-                disconnect_event.set()
+                pass
+            finally:
+                client.close()
         
         disconnect_task = asyncio.create_task(watch_disconnect())
         
         try:
-            # Stream fMP4 chunks to client
-            while not disconnect_event.is_set():
-                chunk = await client.get(timeout=config.server.connection_timeout)
-                
-                if chunk is None:
-                    # Timeout — connection still alive, just no data yet
-                    continue
-                
+            # Init segment (ftyp + moov) must come first; it goes out in the
+            # same write as the first media fragment
+            message = await client.get()
+            if message is not None:
+                message = {
+                    "type": "http.response.body",
+                    "body": init + message["body"],
+                    "more_body": True,
+                }
+            
+            # Stream fMP4 chunks to client until the queue is closed
+            while message is not None:
                 try:
-                    await send({
-                        "type": "http.response.body",
-                        "body": chunk,
-                        "more_body": True,
-                    })
+                    await send(message)  # usually the shared message built by broadcast()
                 except (Exception, asyncio.CancelledError):
                     break
+                message = await client.get()
                     
         except (Exception, asyncio.CancelledError):
             pass
@@ -149,12 +171,32 @@ class HttpStreamHandler:
 
 
 class StatsHandler:
-    """Handler for server statistics (HTTP)."""
+    """Handler for server statistics (HTTP).
     
-    @staticmethod
-    async def handle(scope: Scope, receive: Receive, send: Send) -> None:
+    The response is rebuilt at most every STATS_TTL seconds; polls in
+    between send the cached messages as-is.
+    """
+    
+    _expires_at: float = 0.0
+    _start_message: Dict[str, Any] = {}
+    _body_message: Dict[str, Any] = {}
+    
+    @classmethod
+    async def handle(cls, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle stats request."""
+        now = time.monotonic()
+        if now >= cls._expires_at:
+            cls._build_response()
+            cls._expires_at = now + STATS_TTL
+        
+        await send(cls._start_message)
+        await send(cls._body_message)
+    
+    @classmethod
+    def _build_response(cls) -> None:
+        """Snapshot the current stats into ready-to-send ASGI messages."""
         stream_stats = broadcaster.stats
+        video = config.video
         
         stats = {
             "broadcaster": {
@@ -168,24 +210,20 @@ class StatsHandler:
             },
             "connections": connection_manager.get_stats(),
             "config": {
-                "video_fps": config.video.fps,
-                "video_crf": config.video.effective_crf,
-                "audio_bitrate": config.video.audio_bitrate,
+                "video_fps": video.fps,
+                "video_crf": video.effective_crf,
+                "audio_bitrate": video.audio_bitrate,
             }
         }
         
-        body = json.dumps(stats, indent=2).encode()
+        body = _dump_json(stats)
         
-        await send({
+        cls._start_message = {
             "type": "http.response.start",
             "status": 200,
-            "headers": [
-                (b"content-type", b"application/json"),
-                (b"content-length", str(len(body)).encode()),
-                (b"access-control-allow-origin", b"*"),
-            ],
-        })
-        await send({
+            "headers": [*STATS_HEADERS, (b"content-length", str(len(body)).encode())],
+        }
+        cls._body_message = {
             "type": "http.response.body",
             "body": body,
-        })
+        }
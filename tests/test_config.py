@@ -0,0 +1,34 @@
+"""Tests for source classification."""
+
+import pytest
+
+from lib.config import SourceType, _classify_source
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("rtsp://camera.local/stream", SourceType.LIVE_STREAM),
+        ("RTMP://example.com/live", SourceType.LIVE_STREAM),
+        ("https://example.com/stream.m3u8", SourceType.LIVE_STREAM),
+        ("srt://0.0.0.0:9000", SourceType.LIVE_STREAM),
+        ("udp://239.0.0.1:1234", SourceType.LIVE_STREAM),
+        ("/dev/video0", SourceType.DEVICE),
+        ("/DEV/VIDEO0", SourceType.FILE),  # device paths are case-sensitive
+        ("avfoundation:0", SourceType.DEVICE),
+        ("AVFoundation:0:1", SourceType.DEVICE),
+        ("dshow:video=Webcam", SourceType.DEVICE),
+        ("video=Integrated Camera", SourceType.DEVICE),
+        ("video.mp4", SourceType.FILE),
+        ("/srv/media/rtsp://not-a-url.mp4", SourceType.FILE),
+        ("/home/user/dev/video0.mp4", SourceType.FILE),
+    ],
+)
+def test_classify_source(path, expected):
+    assert _classify_source(path, False) is expected
+
+
+def test_growing_hint_only_applies_to_files():
+    assert _classify_source("recording.mkv", True) is SourceType.GROWING_FILE
+    assert _classify_source("rtsp://camera.local/stream", True) is SourceType.LIVE_STREAM
+    assert _classify_source("/dev/video0", True) is SourceType.DEVICE
@@ -0,0 +1,79 @@
+"""Tests for the per-client queues."""
+
+import asyncio
+
+from services.connection import ClientQueue
+
+
+def body(data):
+    return {"type": "http.response.body", "body": data, "more_body": True}
+
+
+def test_single_message_returned_as_is():
+    queue = ClientQueue(maxsize=4)
+    message = body(b"a")
+    queue.put_nowait(message, now=1.0)
+    assert asyncio.run(queue.get()) is message
+    assert queue.qsize() == 0
+
+
+def test_backlog_merged_into_one_message():
+    queue = ClientQueue(maxsize=4)
+    for data in (b"a", b"bb", b"ccc"):
+        queue.put_nowait(body(data), now=1.0)
+    
+    message = asyncio.run(queue.get())
+    assert message == body(b"abbccc")
+    assert queue.qsize() == 0
+    assert queue.stats.chunks_sent == 3
+    assert queue.stats.bytes_sent == 6
+    assert queue.stats.chunks_dropped == 0
+
+
+def test_full_queue_drops_oldest_and_counts_it():
+    queue = ClientQueue(maxsize=2)
+    for data in (b"a", b"b", b"c", b"d"):
+        queue.put_nowait(body(data), now=1.0)
+    
+    assert queue.stats.chunks_dropped == 2
+    assert queue.stats.chunks_sent == 4
+    assert asyncio.run(queue.get())["body"] == b"cd"
+
+
+def test_byte_budget_drops_oldest_but_keeps_newest():
+    queue = ClientQueue(maxsize=64, max_bytes=10)
+    for data in (b"1234", b"5678", b"90"):
+        queue.put_nowait(body(data), now=1.0)
+    assert queue.stats.chunks_dropped == 0
+    
+    queue.put_nowait(body(b"abc"), now=1.0)
+    assert queue.stats.chunks_dropped == 1
+    assert queue.qsize() == 3
+    
+    # A single message over the budget is still delivered
+    queue.put_nowait(body(b"x" * 20), now=1.0)
+    assert queue.stats.chunks_dropped == 4
+    assert asyncio.run(queue.get())["body"] == b"x" * 20
+    
+    # The byte count restarts from zero once the backlog is drained
+    queue.put_nowait(body(b"12345"), now=1.0)
+    queue.put_nowait(body(b"67890"), now=1.0)
+    assert queue.stats.chunks_dropped == 4
+    assert asyncio.run(queue.get())["body"] == b"1234567890"
+
+
+def test_closed_queue_rejects_puts_and_wakes_getter():
+    queue = ClientQueue()
+    
+    async def run():
+        waiter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        queue.close()
+        return await waiter
+    
+    assert asyncio.run(run()) is None
+    assert queue.put_nowait(body(b"a"), now=1.0) is False
+
+
+def test_get_timeout_returns_none():
+    assert asyncio.run(ClientQueue().get(timeout=0.01)) is None
@@ -0,0 +1,153 @@
+"""Tests for the ASGI app's static routes and disk fallback."""
+
+import asyncio
+import gzip
+import os
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """The app with the broadcaster marked as started, so no FFmpeg is spawned."""
+    monkeypatch.setattr(main.app, "_broadcaster_started", True)
+    return main.app
+
+
+def request(app, path, headers=()):
+    """Run one GET through the app; returns (status, headers dict, body)."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": list(headers)}
+    asyncio.run(app(scope, None, send))
+    start, body = sent[0], sent[1].get("body", b"")
+    return start["status"], dict(start["headers"]), body
+
+
+@pytest.mark.parametrize("path", ["//index.html", "/index.html/", "/./index.html"])
+def test_non_canonical_index_paths_serve_rendered_page(app, path):
+    status, _, body = request(app, path)
+    expected = request(app, "/index.html")[2]
+    assert status == 200
+    assert body == expected
+    assert b"{{" not in body
+
+
+def test_non_canonical_asset_path_serves_in_memory_copy(app):
+    assert request(app, "//player.js")[2] == request(app, "/player.js")[2]
+
+
+def test_matching_etag_gets_304_with_validators_only(app):
+    status, headers, _ = request(app, "/player.js")
+    etag = headers[b"etag"]
+    assert status == 200
+    
+    for if_none_match in (etag, b"W/" + etag, b'"other", ' + etag, b"*"):
+        status, headers, body = request(app, "/player.js", [(b"if-none-match", if_none_match)])
+        assert status == 304
+        assert body == b""
+        assert headers[b"etag"] == etag
+        assert b"content-length" not in headers
+
+
+def test_stale_etag_gets_full_response(app):
+    status, _, body = request(app, "/player.js", [(b"if-none-match", b'"stale"')])
+    assert status == 200
+    assert body
+
+
+@pytest.mark.parametrize("accept_encoding", [b"gzip", b"deflate, gzip;q=0.5", b"GZIP"])
+def test_gzip_negotiated(app, accept_encoding):
+    identity = request(app, "/player.js")
+    status, headers, body = request(app, "/player.js", [(b"accept-encoding", accept_encoding)])
+    assert status == 200
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"vary"] == b"accept-encoding"
+    assert headers[b"etag"] != identity[1][b"etag"]
+    assert gzip.decompress(body) == identity[2]
+
+
+@pytest.mark.parametrize("accept_encoding", [b"identity", b"gzip;q=0", b"gzip;q=bogus"])
+def test_identity_when_gzip_not_accepted(app, accept_encoding):
+    _, headers, _ = request(app, "/player.js", [(b"accept-encoding", accept_encoding)])
+    assert b"content-encoding" not in headers
+
+
+def test_gzip_etag_does_not_validate_identity(app):
+    gzip_etag = request(app, "/player.js", [(b"accept-encoding", b"gzip")])[1][b"etag"]
+    assert request(app, "/player.js", [(b"if-none-match", gzip_etag)])[0] == 200
+
+
+def test_brotli_preferred_when_available(app):
+    brotli = pytest.importorskip("brotli")
+    identity = request(app, "/player.js")[2]
+    _, headers, body = request(app, "/player.js", [(b"accept-encoding", b"gzip, br")])
+    assert headers[b"content-encoding"] == b"br"
+    assert brotli.decompress(body) == identity
+
+
+def test_minify_js_keeps_lines_and_trailing_comments():
+    source = b'  // header\n  const a = 1;\n\n  const url = "http://x"; // note\n'
+    assert main._minify("a.js", source) == b'const a = 1;\nconst url = "http://x"; // note'
+
+
+def test_minify_css_and_html_drop_comments():
+    assert main._minify("a.css", b"/* c\n */\n  body {\n    margin: 0;\n  }\n") == (
+        b"body {\nmargin: 0;\n}"
+    )
+    assert main._minify("a.html", b"<!-- c -->\n  <p>\n    hi\n  </p>\n") == b"<p>\nhi\n</p>"
+
+
+def test_minify_leaves_other_types_alone():
+    assert main._minify("a.txt", b"  /* keep */\n\n") == b"  /* keep */\n\n"
+
+
+@pytest.fixture
+def public_dir(monkeypatch, tmp_path):
+    """A temporary public/ with an empty disk cache."""
+    public = tmp_path.resolve()
+    monkeypatch.setattr(main, "PUBLIC_DIR", public)
+    monkeypatch.setattr(main, "_disk_cache", {})
+    return public
+
+
+def write(path, body, mtime_ns):
+    path.write_bytes(body)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_disk_file_cached_until_mtime_changes(app, public_dir):
+    path = public_dir / "extra.txt"
+    write(path, b"one", 1_000_000_000)
+    assert request(app, "/extra.txt")[2] == b"one"
+    
+    # Same mtime: the cached body is served without re-reading
+    write(path, b"two", 1_000_000_000)
+    assert request(app, "/extra.txt")[2] == b"one"
+    
+    write(path, b"two", 2_000_000_000)
+    assert request(app, "/extra.txt")[2] == b"two"
+    assert main._disk_cache[path][0] == 2_000_000_000
+
+
+def test_disk_cache_evicts_least_recently_used(app, public_dir, monkeypatch):
+    monkeypatch.setattr(main, "DISK_CACHE_SIZE", 2)
+    for name in ("a.txt", "b.txt", "c.txt"):
+        write(public_dir / name, name.encode(), 1_000_000_000)
+    
+    for path in ("/a.txt", "/b.txt", "/a.txt", "/c.txt"):
+        assert request(app, path)[0] == 200
+    assert list(main._disk_cache) == [public_dir / "a.txt", public_dir / "c.txt"]
+
+
+def test_disk_fallback_refuses_traversal_and_directories(app, public_dir):
+    (public_dir / "sub").mkdir()
+    assert request(app, "/../secret.txt")[0] == 403
+    assert request(app, "/sub")[0] == 404
+    assert request(app, "/missing.txt")[0] == 404
+    assert main._disk_cache == {}